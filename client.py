@@ -0,0 +1,159 @@
+import asyncio
+import argparse
+import json
+
+import pygame
+
+from main import FPS, PIPE_VELOCITY, Game, Pipe, screen
+
+HOST = "127.0.0.1"
+PORT = 8765
+
+
+def encode(message):
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode()
+
+
+class RemoteGame(Game):
+    """A Game whose bird and pipes are driven by the server"""
+
+    def __init__(self, writer, spectator=False):
+        super().__init__()
+        self.writer = writer
+        self.spectator = spectator
+        self.session_id = None
+        self.frame = 0
+        self.running = True
+
+    def handle_events(self):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE and not self.spectator:
+                    self.writer.write(encode({"t": "flap"}))
+                    if self.game_state != "GAME_OVER":
+                        self.sound_manager.play("jump")
+
+                if event.key == pygame.K_ESCAPE:
+                    self.running = False
+
+    def update(self):
+        # Only the sky is animated locally, everything else comes from the server
+        self.night_sky.update()
+
+    def apply(self, message):
+        if "full" in message:
+            self.pipes = []
+            self.frame = message["f"]
+            if self.game_state == "GAME_OVER" and message["g"] == "START":
+                if self.sound_manager.music_loaded:
+                    pygame.mixer.music.play(-1)
+
+        # Pipes move at a fixed speed for every frame the server played
+        if "f" in message:
+            for pipe in self.pipes:
+                pipe.x += (message["f"] - self.frame) * PIPE_VELOCITY
+            self.frame = message["f"]
+
+        for x, gap_y in message.get("p", []):
+            pipe = Pipe(x)
+            pipe.gap_y = gap_y
+            self.pipes.append(pipe)
+        self.pipes = [pipe for pipe in self.pipes if pipe.x >= -pipe.width]
+
+        if "y" in message:
+            self.bird.y = message["y"]
+        if "r" in message:
+            self.bird.rotation = message["r"]
+        self.bird.update_image()
+
+        if "s" in message:
+            self.score = message["s"]
+
+        # Only a pipe crash plays the dead sound, same as Game.on_crash
+        if "d" in message:
+            self.on_crash()
+
+        if "g" in message and message["g"] != self.game_state:
+            if message["g"] == "GAME_OVER":
+                self.game_over_sequence()
+            self.game_state = message["g"]
+
+    async def receive(self, reader):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    print("Disconnected from server")
+                    break
+
+                message = json.loads(line)
+                kind = message.get("t")
+                if kind is None:
+                    self.apply(message)
+                elif kind == "welcome":
+                    self.session_id = message["id"]
+                    pygame.display.set_caption(
+                        f"Flappy Bird - Night Edition (session {self.session_id})")
+                elif kind == "end":
+                    print("Session ended")
+                    break
+                elif kind == "error":
+                    print(f"Server error: {message['msg']}")
+                    if self.session_id is None:
+                        break
+        except ConnectionError:
+            print("Lost connection to server")
+        except (ValueError, KeyError, TypeError, AttributeError):
+            print("Bad message from server")
+        finally:
+            # Stop the render loop however the connection ended
+            self.running = False
+
+
+async def run_client(host, port, watch=None):
+    reader, writer = await asyncio.open_connection(host, port)
+    if watch is None:
+        writer.write(encode({"t": "play"}))
+    else:
+        writer.write(encode({"t": "watch", "id": watch}))
+
+    game = RemoteGame(writer, spectator=watch is not None)
+    receiver = asyncio.create_task(game.receive(reader))
+
+    # Same loop as main(), but yielding to the network between frames
+    loop = asyncio.get_running_loop()
+    next_frame = loop.time()
+    while game.running:
+        game.handle_events()
+        game.update()
+        game.draw(screen)
+
+        pygame.display.flip()
+        next_frame += 1 / FPS
+        await asyncio.sleep(max(0, next_frame - loop.time()))
+
+    receiver.cancel()
+    writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flappy Bird network client")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--watch", type=int, metavar="SESSION",
+                        help="spectate a session instead of playing")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(run_client(args.host, args.port, args.watch))
+    except OSError:
+        print("Could not connect to server")
+    finally:
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -206,6 +206,16 @@ class Bird:
         self.flap_timer = 10  # Trigger wing flap
 
     def update(self):
+        self.move()
+        self.update_image()
+        self.check_bounds()
+
+    def step(self):
+        """Advance the bird physics by one frame without touching the image"""
+        self.move()
+        self.check_bounds()
+
+    def move(self):
         # Apply gravity
         self.velocity += GRAVITY
         self.y += self.velocity
@@ -217,10 +227,7 @@ class Bird:
         if self.flap_timer > 0:
             self.flap_timer -= 1
 
-        # Rotate the bird image
-        self.image = pygame.transform.rotate(self.original_image, self.rotation)
-        self.rect = self.image.get_rect(center=(int(self.x), int(self.y)))
-
+    def check_bounds(self):
         # Check for floor collision
         if self.y + 20 > SCREEN_HEIGHT - FLOOR_HEIGHT:
             self.y = SCREEN_HEIGHT - FLOOR_HEIGHT - 20
@@ -231,6 +238,11 @@ class Bird:
             self.y = 20
             self.velocity = 0
 
+    def update_image(self):
+        # Rotate the bird image
+        self.image = pygame.transform.rotate(self.original_image, self.rotation)
+        self.rect = self.image.get_rect(center=(int(self.x), int(self.y)))
+
     def draw(self, screen):
         screen.blit(self.image, self.rect)
 
@@ -452,10 +464,10 @@ class NightSky:
         screen.blit(glow_surface, (0, SCREEN_HEIGHT - FLOOR_HEIGHT - 30))
 
 
-class Game:
+class World:
+    """Bird, pipes, score and game state without any sound, sky or drawing"""
+
     def __init__(self):
-        self.sound_manager = SoundManager()
-        self.night_sky = NightSky()
         self.bird = Bird(bird_img)
         self.pipes = []
         self.score = 0
@@ -463,43 +475,26 @@ class Game:
         self.pipe_timer = 0
         self.pipe_interval = 100
 
-        # Start background music if loaded
-        if self.sound_manager.music_loaded:
-            pygame.mixer.music.set_volume(0.4)
-            pygame.mixer.music.play(-1)
-
-    def handle_events(self):
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
-                    if self.game_state == "START":
-                        self.game_state = "PLAYING"
-                        self.bird.jump()
-                        self.sound_manager.play("jump")
-                    elif self.game_state == "PLAYING":
-                        self.bird.jump()
-                        self.sound_manager.play("jump")
-                    elif self.game_state == "GAME_OVER":
-                        self.reset_game()
-
-                if event.key == pygame.K_ESCAPE:
-                    pygame.quit()
-                    sys.exit()
-
-    def update(self):
-        self.night_sky.update()
+    def flap(self):
+        # What pressing SPACE does in every state
+        if self.game_state == "START":
+            self.game_state = "PLAYING"
+            self.bird.jump()
+            self.on_jump()
+        elif self.game_state == "PLAYING":
+            self.bird.jump()
+            self.on_jump()
+        elif self.game_state == "GAME_OVER":
+            self.reset_game()
 
+    def step(self):
         if self.game_state == "PLAYING":
-            self.bird.update()
+            self.update_bird()
 
             # Generate new pipes
             self.pipe_timer += 1
             if self.pipe_timer >= self.pipe_interval:
-                self.pipes.append(Pipe(SCREEN_WIDTH))
+                self.spawn_pipe()
                 self.pipe_timer = 0
 
             # Update pipes and check collisions
@@ -508,7 +503,7 @@ class Game:
 
                 if pipe.collide(self.bird):
                     self.bird.alive = False
-                    self.sound_manager.play("dead")
+                    self.on_crash()
 
                 if not pipe.passed and pipe.x + pipe.width < self.bird.x:
                     pipe.passed = True
@@ -520,8 +515,63 @@ class Game:
             if not self.bird.alive:
                 self.game_over_sequence()
 
+    def update_bird(self):
+        self.bird.update()
+
+    def spawn_pipe(self):
+        self.pipes.append(Pipe(SCREEN_WIDTH))
+
+    def on_jump(self):
+        pass
+
+    def on_crash(self):
+        # Bird hit a pipe (hitting the floor is not a crash)
+        pass
+
     def game_over_sequence(self):
         self.game_state = "GAME_OVER"
+
+    def reset_game(self):
+        self.__init__()
+
+
+class Game(World):
+    def __init__(self):
+        self.sound_manager = SoundManager()
+        self.night_sky = NightSky()
+        super().__init__()
+
+        # Start background music if loaded
+        if self.sound_manager.music_loaded:
+            pygame.mixer.music.set_volume(0.4)
+            pygame.mixer.music.play(-1)
+
+    def handle_events(self):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    self.flap()
+
+                if event.key == pygame.K_ESCAPE:
+                    pygame.quit()
+                    sys.exit()
+
+    def update(self):
+        self.night_sky.update()
+        self.step()
+
+    def on_jump(self):
+        self.sound_manager.play("jump")
+
+    def on_crash(self):
+        self.sound_manager.play("dead")
+
+    def game_over_sequence(self):
+        super().game_over_sequence()
         if self.sound_manager.music_loaded:
             pygame.mixer.music.stop()
 
@@ -629,9 +679,6 @@ class Game:
                     (SCREEN_WIDTH // 2 - restart_text.get_width() // 2,
                      SCREEN_HEIGHT // 2 + 80))
 
-    def reset_game(self):
-        self.__init__()
-
 
 # Main game loop
 def main():
@@ -0,0 +1,267 @@
+import asyncio
+import argparse
+import itertools
+import json
+import os
+
+# The server never opens a real window or plays sound, so run pygame headless
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from main import FPS, World
+
+HOST = "127.0.0.1"
+PORT = 8765
+
+# Drop clients that fall this far behind instead of stalling the tick loop
+MAX_BUFFERED = 64 * 1024
+
+
+def encode(message):
+    # One JSON object per line, no spaces
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode()
+
+
+class Session(World):
+    """One player's game, stepped by the server instead of by main()"""
+
+    def __init__(self, session_id):
+        self.id = session_id
+        self.subscribers = []  # writers of the player and any spectators
+        self.joining = []  # writers waiting for their first full snapshot
+        self.backlog = []  # updates of finished games not broadcast yet
+        self.start()
+
+    def start(self):
+        World.__init__(self)
+        self.frame = 0  # number of PLAYING frames, clients move pipes by this
+        self.new_pipes = []
+        self.crashed = False  # hit a pipe since the last broadcast
+        self.sent = None  # last fields broadcast, None forces a full snapshot
+
+    def reset_game(self):
+        # A restart can come before the game over went out, queue it first
+        message = self.delta()
+        if message is not None:
+            self.backlog.append(message)
+        self.start()
+
+    def step(self):
+        if self.game_state == "PLAYING":
+            self.frame += 1
+        super().step()
+
+    def update_bird(self):
+        # Nobody looks at the sprite on the server, skip rotating it
+        self.bird.step()
+
+    def spawn_pipe(self):
+        super().spawn_pipe()
+        self.new_pipes.append(self.pipes[-1])
+
+    def on_crash(self):
+        self.crashed = True
+
+    def fields(self):
+        return {
+            "f": self.frame,
+            "y": round(self.bird.y, 1),
+            "r": round(self.bird.rotation, 1),
+            "s": self.score,
+            "g": self.game_state,
+        }
+
+    def snapshot(self):
+        message = self.fields()
+        message["full"] = 1
+        message["p"] = [[pipe.x, pipe.gap_y] for pipe in self.pipes]
+        return message
+
+    def delta(self):
+        """Return what changed since the last broadcast, or None"""
+        if self.sent is None:
+            message = self.snapshot()
+        else:
+            current = self.fields()
+            message = {key: value for key, value in current.items()
+                       if self.sent[key] != value}
+            # Existing pipes move at a fixed speed, so only new ones are sent
+            if self.new_pipes:
+                message["p"] = [[pipe.x, pipe.gap_y] for pipe in self.new_pipes]
+            # Lets clients play the crash sound, floor deaths are silent
+            if self.crashed:
+                message["d"] = 1
+
+        self.sent = self.fields()
+        self.new_pipes = []
+        self.crashed = False
+        return message or None
+
+    def updates(self):
+        """Return every message for the next broadcast, oldest first"""
+        messages = self.backlog
+        self.backlog = []
+        message = self.delta()
+        if message is not None:
+            messages.append(message)
+        return messages
+
+
+class GameServer:
+    def __init__(self, tick_rate=FPS, send_every=1):
+        self.tick_rate = tick_rate
+        self.send_every = send_every
+        self.sessions = {}
+        self.session_ids = itertools.count(1)
+        self.tick = 0
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.tick_rate
+        next_tick = loop.time()
+
+        while True:
+            for session in self.sessions.values():
+                session.step()
+
+            self.tick += 1
+            if self.tick % self.send_every == 0:
+                self.broadcast()
+
+            next_tick += interval
+            delay = next_tick - loop.time()
+            if delay < 0:
+                # Running behind, slow the game down rather than bursting ticks
+                next_tick = loop.time()
+                delay = 0
+            await asyncio.sleep(delay)
+
+    def broadcast(self):
+        for session in self.sessions.values():
+            messages = session.updates()
+            if len(messages) == 1 and "full" in messages[0]:
+                # Already a full snapshot, good enough for new clients too
+                session.subscribers.extend(session.joining)
+                session.joining = []
+
+            # Encode once per session and share it with every subscriber
+            if messages:
+                data = b"".join(encode(message) for message in messages)
+                for writer in session.subscribers[:]:
+                    self.send(session, writer, data)
+
+            # New clients start from a full snapshot taken at the same point
+            if session.joining:
+                data = encode(session.snapshot())
+                for writer in session.joining[:]:
+                    self.send(session, writer, data)
+                session.subscribers.extend(session.joining)
+                session.joining = []
+
+    def send(self, session, writer, data):
+        if writer.transport.get_write_buffer_size() > MAX_BUFFERED:
+            print(f"Dropping slow client from session {session.id}")
+            if writer in session.subscribers:
+                session.subscribers.remove(writer)
+            if writer in session.joining:
+                session.joining.remove(writer)
+            # close() would wait for the stuck buffer to flush,
+            # abort() drops it so handle_client cleans up now
+            writer.transport.abort()
+        else:
+            writer.write(data)
+
+    async def handle_client(self, reader, writer):
+        session = None
+        owner = False
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Longer than the stream limit, the line can't be recovered
+                    writer.write(encode({"t": "error", "msg": "line too long"}))
+                    break
+                if not line:
+                    break
+
+                try:
+                    message = json.loads(line)
+                    kind = message["t"]
+                except (ValueError, KeyError, TypeError):
+                    writer.write(encode({"t": "error", "msg": "bad message"}))
+                    continue
+
+                if kind == "flap":
+                    if owner:
+                        session.flap()
+
+                elif kind == "play" and session is None:
+                    session = Session(next(self.session_ids))
+                    owner = True
+                    self.sessions[session.id] = session
+                    self.subscribe(session, writer)
+                    print(f"Session {session.id} started")
+
+                elif kind == "watch" and session is None:
+                    session_id = message.get("id")
+                    if type(session_id) is int:
+                        session = self.sessions.get(session_id)
+                    if session is None:
+                        writer.write(encode({"t": "error", "msg": "no such session"}))
+                    else:
+                        self.subscribe(session, writer)
+
+                else:
+                    writer.write(encode({"t": "error", "msg": f"unexpected {kind}"}))
+        except ConnectionError:
+            pass
+        finally:
+            if session is not None:
+                if writer in session.subscribers:
+                    session.subscribers.remove(writer)
+                if writer in session.joining:
+                    session.joining.remove(writer)
+                if owner:
+                    del self.sessions[session.id]
+                    for spectator in session.subscribers + session.joining:
+                        spectator.write(encode({"t": "end"}))
+                    print(f"Session {session.id} ended with score {session.score}")
+            writer.close()
+
+    def subscribe(self, session, writer):
+        writer.write(encode({"t": "welcome", "id": session.id}))
+        session.joining.append(writer)
+
+
+async def serve(host, port, tick_rate, send_every):
+    game_server = GameServer(tick_rate, send_every)
+    server = await asyncio.start_server(game_server.handle_client, host, port)
+    print(f"Serving on {host}:{port} at {tick_rate} ticks per second")
+
+    async with server:
+        await game_server.run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flappy Bird multi-session server")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--tick-rate", type=int, default=FPS)
+    parser.add_argument("--send-every", type=int, default=1,
+                        help="send updates every N ticks (batches deltas)")
+    args = parser.parse_args()
+    if args.tick_rate < 1:
+        parser.error("--tick-rate must be at least 1")
+    if args.send_every < 1:
+        parser.error("--send-every must be at least 1")
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.tick_rate, args.send_every))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("pygame", reason="the game and server need pygame installed")
+
+import server
+from client import RemoteGame
+from main import PIPE_GAP
+
+
+class FakeTransport:
+    def get_write_buffer_size(self):
+        return 0
+
+
+class FakeWriter:
+    """Collects what the server writes and feeds it to a RemoteGame"""
+
+    def __init__(self):
+        self.transport = FakeTransport()
+        self.messages = []
+        self.game = RemoteGame(self, spectator=True)
+
+    def write(self, data):
+        for line in data.decode().splitlines():
+            message = json.loads(line)
+            self.messages.append(message)
+            if "t" not in message:
+                self.game.apply(message)
+
+    def updates(self):
+        return [message for message in self.messages if "t" not in message]
+
+
+def autopilot(session):
+    # A flap climbs about 100px, so stay near the bottom of the next gap
+    target = 250
+    for pipe in session.pipes:
+        if pipe.x + pipe.width > session.bird.x:
+            target = pipe.gap_y + PIPE_GAP - 30
+            break
+    if session.game_state != "PLAYING" or (
+            session.bird.y > target and session.bird.velocity > 0):
+        session.flap()
+
+
+def assert_in_sync(session, game):
+    assert game.game_state == session.game_state
+    assert game.score == session.score
+    assert game.frame == session.frame
+    assert game.bird.y == round(session.bird.y, 1)
+    assert ([(pipe.x, pipe.gap_y) for pipe in game.pipes]
+            == [(pipe.x, pipe.gap_y) for pipe in session.pipes])
+
+
+def spawn_pipe_next_step(session):
+    session.pipe_timer = session.pipe_interval - 1
+
+
+async def start():
+    game_server = server.GameServer()
+    tcp_server = await asyncio.start_server(game_server.handle_client, "127.0.0.1", 0)
+    port = tcp_server.sockets[0].getsockname()[1]
+    return game_server, tcp_server, port
+
+
+async def wait_for(condition):
+    for _ in range(200):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("timed out")
+
+
+async def read_until(reader, kind):
+    while True:
+        line = await asyncio.wait_for(reader.readline(), 2)
+        assert line, f"connection closed before {kind}"
+        message = json.loads(line)
+        if message.get("t") == kind:
+            return message
+
+
+def test_stalled_owner_is_dropped_and_session_removed():
+    async def scenario():
+        game_server, tcp_server, port = await start()
+        async with tcp_server:
+            # The owner never reads anything
+            _, owner = await asyncio.open_connection("127.0.0.1", port)
+            owner.write(server.encode({"t": "play"}))
+            await wait_for(lambda: 1 in game_server.sessions)
+            session = game_server.sessions[1]
+
+            spectator_reader, spectator = await asyncio.open_connection("127.0.0.1", port)
+            spectator.write(server.encode({"t": "watch", "id": 1}))
+            await read_until(spectator_reader, "welcome")
+            game_server.broadcast()
+
+            # Fill the owner's transport buffer past what the socket takes
+            owner_writer = session.subscribers[0]
+            owner_writer.write(b"x" * (32 * 1024 * 1024))
+            assert owner_writer.transport.get_write_buffer_size() > server.MAX_BUFFERED
+
+            session.flap()
+            session.step()
+            game_server.broadcast()
+
+            await wait_for(lambda: 1 not in game_server.sessions)
+            await read_until(spectator_reader, "end")
+
+            owner.close()
+            spectator.close()
+
+    asyncio.run(scenario())
+
+
+def test_watch_with_bad_id_gets_error():
+    async def scenario():
+        game_server, tcp_server, port = await start()
+        async with tcp_server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(server.encode({"t": "watch", "id": [1]}))
+            message = await read_until(reader, "error")
+            assert message["msg"] == "no such session"
+            writer.close()
+
+    asyncio.run(scenario())
+
+
+def test_overlong_line_disconnects_cleanly():
+    async def scenario():
+        errors = []
+        asyncio.get_running_loop().set_exception_handler(
+            lambda loop, context: errors.append(context))
+
+        game_server, tcp_server, port = await start()
+        async with tcp_server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"x" * (128 * 1024) + b"\n")
+            try:
+                # The error reply may be lost to a reset, unread input is discarded
+                while await asyncio.wait_for(reader.readline(), 2):
+                    pass
+            except ConnectionResetError:
+                pass
+            writer.close()
+            await asyncio.sleep(0.05)
+
+        assert errors == []
+
+    asyncio.run(scenario())
+
+
+def test_idle_session_sends_nothing():
+    session = server.Session(1)
+    assert "full" in session.delta()
+    assert session.delta() is None
+    session.step()
+    assert session.delta() is None
+
+
+def test_playing_step_sends_only_changed_fields():
+    session = server.Session(1)
+    session.delta()
+
+    session.flap()
+    session.step()
+    assert set(session.delta()) == {"f", "y", "r", "g"}
+
+    session.step()
+    assert set(session.delta()) == {"f", "y", "r"}
+
+
+def test_only_new_pipes_are_sent():
+    session = server.Session(1)
+    session.flap()
+    spawn_pipe_next_step(session)
+    session.step()
+    first = session.pipes[0]
+    assert session.delta()["p"] == [[first.x, first.gap_y]]
+
+    session.step()
+    assert "p" not in session.delta()
+
+    spawn_pipe_next_step(session)
+    session.step()
+    assert len(session.pipes) == 2
+    second = session.pipes[1]
+    assert session.delta()["p"] == [[second.x, second.gap_y]]
+
+
+def test_reset_sends_full_snapshot():
+    session = server.Session(1)
+    session.flap()
+    spawn_pipe_next_step(session)
+    session.step()
+    session.delta()
+
+    session.reset_game()
+    message = session.delta()
+    assert message["full"] == 1
+    assert message["g"] == "START"
+    assert message["p"] == []
+
+
+@pytest.mark.parametrize("send_every", [1, 3])
+def test_clients_stay_in_sync(send_every):
+    game_server = server.GameServer(send_every=send_every)
+    session = server.Session(1)
+    game_server.sessions[1] = session
+    player = FakeWriter()
+    game_server.subscribe(session, player)
+    watcher = FakeWriter()
+
+    best_score = 0
+    for tick in range(1, 1501):
+        autopilot(session)
+        session.step()
+        best_score = max(best_score, session.score)
+        if tick == 700:
+            game_server.subscribe(session, watcher)
+        if tick % send_every == 0:
+            game_server.broadcast()
+            assert_in_sync(session, player.game)
+            if tick > 700:
+                assert_in_sync(session, watcher.game)
+
+    assert best_score > 0
+
+
+def test_watcher_joining_between_broadcasts_gets_full_snapshot():
+    game_server = server.GameServer(send_every=3)
+    session = server.Session(1)
+    game_server.sessions[1] = session
+    game_server.subscribe(session, FakeWriter())
+    game_server.broadcast()
+
+    session.flap()
+    spawn_pipe_next_step(session)
+    session.step()
+    watcher = FakeWriter()
+    game_server.subscribe(session, watcher)
+    assert watcher.updates() == []
+
+    session.step()
+    session.step()
+    game_server.broadcast()
+    for _ in range(3):
+        session.step()
+    game_server.broadcast()
+
+    updates = watcher.updates()
+    assert watcher.messages[0]["t"] == "welcome"
+    assert len(updates) == 2
+    assert updates[0]["full"] == 1
+    assert len(updates[0]["p"]) == 1
+    assert "full" not in updates[1]
+    assert_in_sync(session, watcher.game)
+
+
+def test_crash_is_sent_when_player_restarts_before_broadcast():
+    game_server = server.GameServer(send_every=3)
+    session = server.Session(1)
+    game_server.sessions[1] = session
+    player = FakeWriter()
+    crashes = []
+    player.game.on_crash = lambda: crashes.append(True)
+    game_server.subscribe(session, player)
+    game_server.broadcast()
+
+    # Put a pipe right on the bird, then restart within the same broadcast
+    session.flap()
+    spawn_pipe_next_step(session)
+    session.step()
+    session.pipes[0].x = session.bird.x - 10
+    session.pipes[0].gap_y = session.bird.y + 100
+    session.step()
+    assert session.game_state == "GAME_OVER"
+    session.flap()
+    session.step()
+    game_server.broadcast()
+
+    game_over, restart = player.updates()[1:]
+    assert game_over["g"] == "GAME_OVER"
+    assert game_over["d"] == 1
+    assert restart["full"] == 1
+    assert restart["g"] == "START"
+    assert crashes == [True]
+    assert_in_sync(session, player.game)
+
+
+def test_slow_joining_client_is_dropped():
+    game_server = server.GameServer()
+    session = server.Session(1)
+    game_server.sessions[1] = session
+    player = FakeWriter()
+    game_server.subscribe(session, player)
+    game_server.broadcast()
+
+    watcher = FakeWriter()
+    aborted = []
+    watcher.transport.get_write_buffer_size = lambda: server.MAX_BUFFERED + 1
+    watcher.transport.abort = lambda: aborted.append(True)
+    game_server.subscribe(session, watcher)
+    game_server.broadcast()
+
+    assert aborted == [True]
+    assert watcher.updates() == []
+    assert session.subscribers == [player]
+    assert session.joining == []